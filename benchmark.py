@@ -0,0 +1,317 @@
+"""Headless performance benchmarks for Mini Eclipse.
+
+Drives a real MiniEclipseIDE (from source.PY) against synthetic workloads and
+prints per-operation latency percentiles and peak RSS as JSON. Each workload
+runs in its own process, so process_peak_rss_kb is that workload's high-water
+mark (baseline_rss_kb is the same figure just after the IDE was built):
+
+    xvfb-run python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json      # exit 1 on regressions
+
+Without a DISPLAY an Xvfb server is started automatically if one is installed.
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_ide(path=os.path.join(HERE, "source.PY")):
+    loader = importlib.machinery.SourceFileLoader("mini_eclipse", path)
+    spec = importlib.util.spec_from_loader("mini_eclipse", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def ensure_display():
+    # Returns the Xvfb process we started, if any
+    if os.environ.get("DISPLAY") or os.name == "nt" or sys.platform == "darwin":
+        return None
+    if not shutil.which("Xvfb"):
+        sys.exit("benchmark.py needs an X display: set DISPLAY or install Xvfb")
+    display = f":{random.randint(100, 999)}"
+    xvfb = subprocess.Popen(["Xvfb", display, "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket = f"/tmp/.X11-unix/X{display[1:]}"
+    deadline = time.time() + 10
+    while not os.path.exists(socket):
+        if xvfb.poll() is not None or time.time() > deadline:
+            sys.exit("could not start Xvfb")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = display
+    return xvfb
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def python_source(lines):
+    block = [
+        "class Widget{n}(object):",
+        '    """Synthetic class {n}.',
+        "",
+        "    Spans a few lines so the lexer has to carry string state.",
+        '    """',
+        "    def method(self, value=None):",
+        "        # comment with 'quotes' and keywords: if for while",
+        "        if value is not None and value in (1, 2, 3):",
+        "            return f\"value={{value}}\"",
+        "        for i in range({n}):",
+        "            value = i * 2  # trailing comment",
+        "        return 'done'",
+        "",
+    ]
+    out = []
+    n = 0
+    while len(out) < lines:
+        out.extend(line.format(n=n) for line in block)
+        n += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+class Bench:
+    def __init__(self, mod, repeat, workdir):
+        self.mod = mod
+        self.repeat = repeat
+        self.workdir = workdir
+        self.results = {}
+        self.root = mod.ctk.CTk()
+        self.root.geometry("1300x900")
+        self.ide = mod.MiniEclipseIDE(self.root)
+        self.pump_for(0.3)
+        self.baseline_rss_kb = peak_rss_kb()
+
+    # ---------- helpers ----------
+    def pump(self):
+        self.root.update()
+
+    def pump_until(self, done, timeout=600):
+        deadline = time.perf_counter() + timeout
+        while not done():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("workload did not finish")
+            self.pump()
+            time.sleep(0.001)
+
+    def pump_for(self, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            self.pump()
+            time.sleep(0.001)
+
+    def record(self, name, samples, **extra):
+        self.results[name] = dict(latency_ms=self.mod.percentiles(samples),
+                                  process_peak_rss_kb=peak_rss_kb(),
+                                  baseline_rss_kb=self.baseline_rss_kb, **extra)
+        print(f"  {name}: {self.results[name]['latency_ms']}", file=sys.stderr)
+
+    def drain_highlighter(self):
+        hl = self.ide.highlighter
+        while hl.dirty:
+            hl._flush()
+        if hl._job is not None:
+            self.root.after_cancel(hl._job)
+            hl._job = None
+
+    # ---------- workloads ----------
+    def editor(self, lines):
+        path = os.path.join(self.workdir, f"module_{lines}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(python_source(lines))
+        ide, text = self.ide, self.ide.text_editor
+
+        samples = []
+        for _ in range(self.repeat):
+            loaded = []
+            start = time.perf_counter()
+            ide.load_file(path, on_loaded=lambda: loaded.append(time.perf_counter()))
+            self.pump_until(lambda: loaded)
+            samples.append((loaded[0] - start) * 1000)
+        self.record(f"load_file/{lines}_lines", samples)
+
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            ide.apply_syntax_highlighting()
+            self.drain_highlighter()
+            samples.append((time.perf_counter() - start) * 1000)
+        self.record(f"apply_syntax_highlighting/full/{lines}_lines", samples)
+
+        text.see(f"{lines // 2}.0")
+        self.pump()
+        keystrokes, gutter = [], []
+        for i in range(self.repeat * 20):
+            line = lines // 2 + i % 20
+            start = time.perf_counter()
+            text.insert(f"{line}.0", '"' if i % 5 == 0 else "x")
+            self.drain_highlighter()
+            keystrokes.append((time.perf_counter() - start) * 1000)
+            text.yview_moveto(random.random())
+            self.root.update_idletasks()
+            start = time.perf_counter()
+            ide.line_numbers.redraw()
+            gutter.append((time.perf_counter() - start) * 1000)
+        self.record(f"apply_syntax_highlighting/keystroke/{lines}_lines", keystrokes)
+        self.record(f"update_line_numbers/{lines}_lines", gutter)
+        ide.new_file()
+
+    def explorer(self, entries):
+        folder = os.path.join(self.workdir, f"tree_{entries}")
+        os.makedirs(folder)
+        for i in range(entries):
+            open(os.path.join(folder, f"file_{i:06d}.py"), "w").close()
+        ide = self.ide
+        first, complete = [], []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            ide.folder_path = folder
+            ide.refresh_explorer()
+            explorer = ide.explorer
+            self.pump_until(lambda: len(explorer.rows) > 1)
+            first.append((time.perf_counter() - start) * 1000)
+            self.pump_until(lambda: not explorer.root_node.loading)
+            self.pump()
+            complete.append((time.perf_counter() - start) * 1000)
+        self.record(f"refresh_explorer/first_rows/{entries}_entries", first)
+        self.record(f"refresh_explorer/complete/{entries}_entries", complete)
+
+    def output(self, lines):
+        ide = self.ide
+        calls = []
+        start = time.perf_counter()
+        for i in range(lines):
+            t = time.perf_counter()
+            ide.log_output(f"log line {i}")
+            calls.append((time.perf_counter() - t) * 1000)
+        self.pump_until(lambda: not ide.output.pending)
+        self.record(f"log_output/{lines}_lines", calls,
+                    total_ms=round((time.perf_counter() - start) * 1000, 1))
+
+        # A child process flooding stdout, with the lag probe running
+        script = os.path.join(self.workdir, "flood.py")
+        with open(script, "w") as f:
+            f.write(f"for i in range({lines}):\n    print('flood', i, 'x' * 60)\n")
+        ide.perf.start([(ide.output, "flush", "output flush")])
+        exited = []
+        ide.on_process_exit = exited.append
+        start = time.perf_counter()
+        ide.runner.start([sys.executable, script], cwd=self.workdir)
+        self.pump_until(lambda: exited and not ide.output.pending)
+        total = (time.perf_counter() - start) * 1000
+        snap = ide.perf.snapshot()
+        ide.perf.stop()
+        self.record(f"stdout_flood/event_loop_lag/{lines}_lines", list(ide.perf.lag),
+                    total_ms=round(total, 1), output_flush_ms=snap["callbacks_ms"]["output flush"],
+                    discarded_lines=ide.output.dropped + ide.output.trimmed)
+        del ide.on_process_exit
+        ide.clear_output()
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for name, entry in results.items():
+        old = baseline.get(name, {}).get("latency_ms", {}).get("p50")
+        new = entry["latency_ms"].get("p50")
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append({"operation": name, "baseline_p50": old, "p50": new})
+    return regressions
+
+
+def run_workload(spec, repeat):
+    # spec is "<Bench method>:<size>", e.g. "editor:10000"
+    kind, _, size = spec.partition(":")
+    workdir = tempfile.mkdtemp(prefix="mini_eclipse_bench_")
+    try:
+        bench = Bench(load_ide(), repeat, workdir)
+        getattr(bench, kind)(int(size))
+        bench.root.destroy()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return bench.results
+
+
+def run_isolated(spec, repeat):
+    # A fresh interpreter per workload keeps ru_maxrss from carrying over
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--workload", spec,
+                        "--repeat", str(repeat), "--output", path], check=True)
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dir-entries", type=int, default=100000)
+    parser.add_argument("--flood-lines", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="previous report; exit 1 if any p50 regresses")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown against --baseline (default 25%%)")
+    parser.add_argument("--workload", help=argparse.SUPPRESS)   # child process mode
+    args = parser.parse_args(argv)
+
+    if args.workload:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(run_workload(args.workload, args.repeat), f)
+        return 0
+
+    xvfb = ensure_display()
+    specs = [f"editor:{lines}" for lines in args.lines]
+    specs += [f"explorer:{args.dir_entries}", f"output:{args.flood_lines}"]
+    results = {}
+    try:
+        for spec in specs:
+            print(spec, file=sys.stderr)
+            results.update(run_isolated(spec, args.repeat))
+    except subprocess.CalledProcessError as e:
+        sys.exit(f"workload {e.cmd[3]} failed with exit code {e.returncode}")
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat},
+        "results": results,
+    }
+    if args.baseline:
+        report["regressions"] = compare(results, args.baseline, args.tolerance)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
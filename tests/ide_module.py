@@ -0,0 +1,19 @@
+import importlib.machinery
+import importlib.util
+import os
+import unittest
+
+try:
+    import customtkinter  # noqa: F401  (source.PY imports it at module level)
+except ImportError:
+    raise unittest.SkipTest("customtkinter is not installed")
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "source.PY")
+
+
+def load_ide():
+    loader = importlib.machinery.SourceFileLoader("mini_eclipse", SOURCE)
+    spec = importlib.util.spec_from_loader("mini_eclipse", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,107 @@
+import codecs
+import os
+import stat
+import tempfile
+import unittest
+
+from ide_module import load_ide
+
+
+class DetectEncodingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.detect = staticmethod(load_ide().detect_encoding)
+
+    def test_boms(self):
+        self.assertEqual(self.detect(codecs.BOM_UTF8 + b"x = 1\n"), "utf-8-sig")
+        self.assertEqual(self.detect(codecs.BOM_UTF16_LE + "x".encode("utf-16-le")), "utf-16")
+        self.assertEqual(self.detect(codecs.BOM_UTF16_BE + "x".encode("utf-16-be")), "utf-16")
+
+    def test_coding_cookie_on_first_two_lines(self):
+        self.assertEqual(self.detect(b"# -*- coding: latin-1 -*-\n"), "iso8859-1")
+        self.assertEqual(self.detect(b"#!/usr/bin/env python\n# coding=cp1252\n"), "cp1252")
+        # Only the first two lines count
+        self.assertEqual(self.detect(b"\n\n# coding: cp1252\n"), "utf-8")
+
+    def test_unknown_cookie_falls_back_to_content(self):
+        self.assertEqual(self.detect(b"# coding: no-such-codec\nx = 1\n"), "utf-8")
+
+    def test_utf8_and_invalid_bytes(self):
+        self.assertEqual(self.detect("s = 'café'\n".encode("utf-8")), "utf-8")
+        self.assertEqual(self.detect(b"s = 'caf\xe9'\nmore text\n"), "latin-1")
+
+    def test_multibyte_character_cut_at_the_end(self):
+        head = ("x" * 100 + "€").encode("utf-8")[:-1]
+        self.assertEqual(self.detect(head), "utf-8")
+
+
+class WriteAtomicTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.write_atomic = staticmethod(load_ide().write_atomic)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_writes_all_chunks_and_leaves_no_temp_file(self):
+        path = os.path.join(self.dir, "a.py")
+        self.write_atomic(path, ["one\n", "two\n", "é\n"])
+        self.assertEqual(self.read(path), "one\ntwo\né\n")
+        self.assertEqual(os.listdir(self.dir), ["a.py"])
+
+    def test_failed_write_keeps_original(self):
+        path = os.path.join(self.dir, "a.py")
+        self.write_atomic(path, ["original\n"])
+
+        def chunks():
+            yield "partial\n"
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.write_atomic(path, chunks())
+        self.assertEqual(self.read(path), "original\n")
+        self.assertEqual(os.listdir(self.dir), ["a.py"])
+
+    @unittest.skipIf(os.name != "posix", "POSIX permission bits")
+    def test_existing_mode_is_preserved(self):
+        path = os.path.join(self.dir, "run.sh")
+        self.write_atomic(path, ["#!/bin/sh\n"])
+        os.chmod(path, 0o750)
+        self.write_atomic(path, ["#!/bin/sh\necho hi\n"])
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o750)
+
+    @unittest.skipIf(os.name != "posix", "POSIX permission bits")
+    def test_new_file_follows_umask(self):
+        old = os.umask(0o027)
+        try:
+            path = os.path.join(self.dir, "new.py")
+            self.write_atomic(path, ["x = 1\n"])
+        finally:
+            os.umask(old)
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "needs symlinks")
+    def test_symlink_stays_a_link(self):
+        target = os.path.join(self.dir, "target.py")
+        link = os.path.join(self.dir, "link.py")
+        self.write_atomic(target, ["old\n"])
+        try:
+            os.symlink(target, link)
+        except OSError:
+            self.skipTest("cannot create symlinks here")
+        self.write_atomic(link, ["new\n"])
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(self.read(target), "new\n")
+        self.assertEqual(sorted(os.listdir(self.dir)), ["link.py", "target.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import io
+import json
+import queue
+import struct
+import sys
+import unittest
+
+from ide_module import load_ide
+
+
+class KernelClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ide = load_ide()
+
+    def setUp(self):
+        self.messages = queue.Queue()
+        self.kernel = self.ide.KernelClient(self.messages.put, preload=["math"])
+        self.kernel.start(sys.executable)
+        self.assertEqual(self.next_message()["type"], "ready")
+
+    def tearDown(self):
+        self.kernel.shutdown()
+
+    def next_message(self):
+        try:
+            return self.messages.get(timeout=10)
+        except queue.Empty:
+            self.fail("no message from the kernel")
+
+    def run_code(self, code, on_stream=None):
+        # -> (stdout text, error text or None) for one execute request
+        run_id = self.kernel.execute(code)
+        out = []
+        while True:
+            msg = self.next_message()
+            if msg["type"] == "stream" and msg["id"] == run_id and msg["name"] == "stdout":
+                out.append(msg["text"])
+                if on_stream:
+                    on_stream(msg["text"])
+            elif msg["type"] == "done" and msg["id"] == run_id:
+                return ''.join(out), msg["error"]
+            elif msg["type"] == "exit":
+                self.fail(f"kernel exited: {msg}")
+
+    def test_expression_value_and_persistent_state(self):
+        self.assertEqual(self.run_code("x = 20"), ("", None))
+        self.assertEqual(self.run_code("x + 22"), ("42\n", None))
+        self.assertEqual(self.run_code("print(math.sqrt(x - 4))"), ("4.0\n", None))
+        self.assertEqual(self.run_code("None"), ("", None))
+
+    def test_errors_are_not_chained_to_the_eval_attempt(self):
+        out, error = self.run_code("y = 1\nraise ValueError('bad')")
+        self.assertIn("ValueError: bad", error)
+        self.assertNotIn("During handling", error)
+        self.assertNotIn("SyntaxError", error)
+        _, error = self.run_code("def f(:\n    pass")
+        self.assertIn("SyntaxError", error)
+        self.assertNotIn("During handling", error)
+
+    def test_interrupt_stops_user_code_only(self):
+        code = "import time\nprint('started')\nwhile True:\n    time.sleep(0.01)"
+        out, error = self.run_code(code, on_stream=lambda text: self.kernel.interrupt())
+        self.assertEqual(out, "started\n")
+        self.assertIn("KeyboardInterrupt", error)
+        self.assertEqual(self.run_code("1 + 1"), ("2\n", None))
+
+    def test_shutdown_reports_exit(self):
+        self.kernel.shutdown()
+        while True:
+            msg = self.next_message()
+            if msg["type"] == "exit":
+                break
+        self.assertFalse(self.kernel.is_running())
+
+
+class FakeProcess:
+    def __init__(self, data):
+        self.stdout = io.BytesIO(data)
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+    def wait(self):
+        return -9 if self.killed else 0
+
+
+class ReadFramesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ide = load_ide()
+
+    def frame(self, payload):
+        return struct.pack('>I', len(payload)) + payload
+
+    def read(self, data):
+        messages = []
+        process = FakeProcess(data)
+        self.ide.KernelClient(messages.append)._read_frames(process)
+        return messages, process
+
+    def test_frames_then_exit(self):
+        data = b''.join(self.frame(json.dumps(m).encode()) for m in
+                        ({"type": "ready", "pid": 1}, {"type": "done", "id": 1, "error": None}))
+        messages, process = self.read(data)
+        self.assertEqual([m["type"] for m in messages], ["ready", "done", "exit"])
+        self.assertEqual(messages[-1]["code"], 0)
+        self.assertFalse(process.killed)
+
+    def test_truncated_header_ends_the_stream(self):
+        messages, _ = self.read(self.frame(b'{"type": "ready"}') + b'\x00\x00')
+        self.assertEqual([m["type"] for m in messages], ["ready", "exit"])
+
+    def test_malformed_frame_kills_the_kernel(self):
+        for payload in (b'not json', b'\xff\xfe', b'{"type": "re'):
+            with self.subTest(payload=payload):
+                messages, process = self.read(self.frame(payload) + self.frame(b'{"type": "done"}'))
+                self.assertTrue(process.killed)
+                self.assertEqual(messages, [{"type": "exit", "code": -9}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from ide_module import load_ide
+
+
+class LexLineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lex_line = staticmethod(load_ide().lex_line)
+
+    def test_keywords_strings_and_comment(self):
+        tokens, state = self.lex_line("if x in 'a#b':  # done")
+        self.assertEqual(tokens, [("keyword", 0, 2), ("keyword", 5, 7),
+                                  ("string", 8, 13), ("comment", 16, 22)])
+        self.assertIsNone(state)
+
+    def test_keywords_need_word_boundaries(self):
+        tokens, _ = self.lex_line("define = classic")
+        self.assertEqual(tokens, [])
+
+    def test_escaped_quote_does_not_close_string(self):
+        tokens, state = self.lex_line(r"s = 'it\'s' + 'x'")
+        self.assertEqual(tokens, [("string", 4, 11), ("string", 14, 17)])
+        self.assertIsNone(state)
+
+    def test_unterminated_single_quote_does_not_carry_over(self):
+        tokens, state = self.lex_line("s = 'open")
+        self.assertEqual(tokens, [("string", 4, 9)])
+        self.assertIsNone(state)
+
+    def test_triple_quote_state_carries_across_lines(self):
+        lines = ['x = """start', "if inside: # not code", 'end""" if y', "z"]
+        state = None
+        results = []
+        for line in lines:
+            tokens, state = self.lex_line(line, state)
+            results.append((tokens, state))
+        self.assertEqual(results[0], ([("string", 4, 12)], '"""'))
+        self.assertEqual(results[1], ([("string", 0, 21)], '"""'))
+        self.assertEqual(results[2], ([("string", 0, 6), ("keyword", 7, 9)], None))
+        self.assertEqual(results[3], ([], None))
+
+    def test_single_quoted_triple_delimiter_is_tracked_separately(self):
+        tokens, state = self.lex_line("'''doc \"\"\" still doc", None)
+        self.assertEqual(state, "'''")
+        tokens, state = self.lex_line('""" x', state)
+        self.assertEqual(tokens, [("string", 0, 5)])
+        self.assertEqual(state, "'''")
+
+    def test_escaped_closing_delimiter_keeps_string_open(self):
+        tokens, state = self.lex_line(r'\""" still open', '"""')
+        self.assertEqual(state, '"""')
+        tokens, state = self.lex_line(r'\\""" x', '"""')
+        self.assertEqual(tokens, [("string", 0, 5)])
+        self.assertIsNone(state)
+
+
+if __name__ == "__main__":
+    unittest.main()
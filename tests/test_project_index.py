@@ -0,0 +1,181 @@
+import concurrent.futures
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+import zlib
+
+from ide_module import load_ide
+
+
+class QuickOpenIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ide = load_ide()
+
+    def search(self, paths, query):
+        quick = self.ide.QuickOpenIndex(paths)
+        return [quick.paths[i] for batch in quick.search(query) for i in batch]
+
+    def test_basename_matches_rank_before_path_matches(self):
+        paths = ["init/setup.py", "pkg/__init__.py", "src/long/initial.py", "main.py"]
+        # Shorter basenames rank first; a directory-only match comes last
+        self.assertEqual(self.search(paths, "init"),
+                         ["src/long/initial.py", "pkg/__init__.py", "init/setup.py"])
+
+    def test_subsequence_and_directory_queries(self):
+        paths = ["server/service.py", "core/io/reader.py", "core/other.py"]
+        self.assertEqual(self.search(paths, "srvc"), ["server/service.py"])
+        self.assertEqual(self.search(paths, "core/io"), ["core/io/reader.py"])
+
+    def test_no_match(self):
+        self.assertEqual(self.search(["a.py", "b.py"], "zzz"), [])
+        self.assertEqual(self.search([], "a"), [])
+
+    def test_batches_cover_more_than_one_window(self):
+        paths = [f"d/f{i}.py" for i in range(self.ide.QuickOpenIndex.WINDOW * 2 + 10)]
+        found = self.search(paths, "f1")
+        self.assertEqual(set(found), {p for p in paths if "1" in p.split("/")[1]})
+
+
+class ProjectIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ide = load_ide()
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.write("a.py", "def alpha():\n    return 1\n")
+        self.write("pkg/b.py", "class Beta:\n    pass\n")
+        self.write("blob.bin", "\0binary")
+        self.indexes = []
+
+    def tearDown(self):
+        for index in self.indexes:
+            index.close()
+            if index._pool is not None:
+                index._pool.shutdown(wait=True)
+        self._tmp.cleanup()
+
+    def write(self, rel, text, mtime_ns=None):
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def new_index(self):
+        # Threads instead of the spawn pool: index_file_chunk would have to
+        # be picklable from the module under test
+        index = self.ide.ProjectIndex()
+        index._pool = concurrent.futures.ThreadPoolExecutor(2)
+        self.indexes.append(index)
+        return index
+
+    def wait(self, index):
+        deadline = time.monotonic() + 10
+        while index.busy:
+            self.assertLess(time.monotonic(), deadline, "indexing did not finish")
+            time.sleep(0.01)
+        self.assertFalse(index.status.startswith("Indexing failed"), index.status)
+
+    def open_index(self):
+        index = self.new_index()
+        index.open(self.root)
+        self.wait(index)
+        return index
+
+    def test_build_and_query(self):
+        index = self.open_index()
+        self.assertEqual(sorted(index.files), ["a.py", "blob.bin", "pkg/b.py"])
+        self.assertEqual(index.content_candidates("ALPHA"), ["a.py"])
+        self.assertEqual(index.content_candidates("pass"), ["pkg/b.py"])
+        self.assertEqual(index.content_candidates("missing"), [])
+        # Short queries match every text file, never the binary one
+        self.assertEqual(index.content_candidates("a"), ["a.py", "pkg/b.py"])
+        self.assertTrue(os.path.exists(index.index_path(self.root)))
+
+    def test_reload_from_database(self):
+        self.open_index().close()
+        index = self.new_index()
+        db = index._connect(self.root)
+        try:
+            index._load(db)
+        finally:
+            db.close()
+        self.assertEqual(sorted(index.files), ["a.py", "blob.bin", "pkg/b.py"])
+        self.assertEqual(index.content_candidates("beta"), ["pkg/b.py"])
+
+    def test_noop_update_leaves_database_and_snapshot_alone(self):
+        index = self.open_index()
+        path = index.index_path(self.root)
+        before = os.stat(path).st_mtime_ns, os.path.getsize(path)
+        quick = index.quick
+        index.update()
+        self.wait(index)
+        self.assertEqual((os.stat(path).st_mtime_ns, os.path.getsize(path)), before)
+        self.assertIs(index.quick, quick)
+
+    def test_changed_and_deleted_files(self):
+        index = self.open_index()
+        mtime = os.stat(os.path.join(self.root, "a.py")).st_mtime_ns
+        self.write("a.py", "def gamma():\n    pass\n", mtime_ns=mtime + 10**9)
+        os.remove(os.path.join(self.root, "pkg/b.py"))
+        index.update()
+        self.wait(index)
+        self.assertEqual(sorted(index.files), ["a.py", "blob.bin"])
+        self.assertEqual(index.content_candidates("alpha"), [])
+        self.assertEqual(index.content_candidates("gamma"), ["a.py"])
+        self.assertEqual(index.content_candidates("pass"), ["a.py"])
+        self.assertNotIn("pkg/b.py", index.quick.paths)
+        rels = [rel for rel, in sqlite3.connect(index.index_path(self.root))
+                .execute("SELECT rel FROM files ORDER BY rel")]
+        self.assertEqual(rels, ["a.py", "blob.bin"])
+
+    def test_unreadable_database_is_replaced(self):
+        path = os.path.join(self.root, self.ide.ProjectIndex.INDEX_DIR, "index.db")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(b"not a database" * 100)
+        index = self.open_index()
+        self.assertEqual(index.content_candidates("alpha"), ["a.py"])
+
+    def test_load_skips_malformed_rows(self):
+        index = self.new_index()
+        db = index._connect(self.root)
+        good = self.ide.pack_codes(self.ide.trigram_codes("hello"))
+        rows = [
+            ("good.py", 1, good),
+            ("none.bin", 2, None),
+            ("text_mtime.py", "soon", good),
+            ("text_grams.py", 3, "not bytes"),
+            ("not_zlib.py", 4, b"garbage"),
+            ("odd_length.py", 5, zlib.compress(b"1234567")),
+        ]
+        db.executemany("INSERT INTO files (rel, mtime, grams) VALUES (?, ?, ?)", rows)
+        db.commit()
+        try:
+            index._load(db)
+        finally:
+            db.close()
+        self.assertEqual(sorted(index.files), ["good.py", "none.bin"])
+        self.assertEqual(index.content_candidates("hell"), ["good.py"])
+        self.assertEqual(sorted(index.quick.paths), ["good.py", "none.bin"])
+
+    def test_foreign_schema_is_dropped(self):
+        path = os.path.join(self.root, self.ide.ProjectIndex.INDEX_DIR, "index.db")
+        os.makedirs(os.path.dirname(path))
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE files (x)")
+        db.execute("INSERT INTO files VALUES ('x')")
+        db.commit()
+        db.close()
+        index = self.open_index()
+        self.assertEqual(sorted(index.files), ["a.py", "blob.bin", "pkg/b.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
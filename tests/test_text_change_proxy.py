@@ -0,0 +1,116 @@
+import re
+import unittest
+
+from ide_module import load_ide
+
+
+class FakeTextTk:
+    # Just enough of a Tk text widget command for TextChangeProxy: indices
+    # like "3.0-1c", "1.end", "end", and insert/delete/replace with Tk's
+    # rule that the final newline is never deleted.
+    def __init__(self, content):
+        self.content = content + '\n'
+        self.commands = {}
+
+    def createcommand(self, name, func):
+        self.commands[name] = func
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        if args[0] == "rename":
+            return ""
+        command, rest = args[1], args[2:]
+        if command == "index":
+            return self._index(self._offset(rest[0]))
+        if command == "insert":
+            at = min(self._offset(rest[0]), len(self.content) - 1)
+            self.content = self.content[:at] + ''.join(rest[1::2]) + self.content[at:]
+        elif command in ("delete", "replace"):
+            start = self._offset(rest[0])
+            end = self._offset(rest[1]) if len(rest) > 1 else start + 1
+            end = min(end, len(self.content) - 1)
+            text = ''.join(rest[2::2]) if command == "replace" else ''
+            if start < end or text:
+                self.content = self.content[:start] + text + self.content[max(start, end):]
+        return ""
+
+    def line_count(self):
+        return self.content.count('\n')
+
+    def _offset(self, index):
+        m = re.fullmatch(r'(end|\d+\.(?:\d+|end))((?:[+-]\d+c)*)', index)
+        base, mods = m.group(1), m.group(2)
+        if base == "end":
+            offset = len(self.content)
+        else:
+            line, col = base.split('.')
+            lines = self.content.split('\n')
+            offset = sum(len(l) + 1 for l in lines[:int(line) - 1])
+            current = lines[int(line) - 1]
+            offset += len(current) if col == "end" else min(int(col), len(current))
+        for amount in re.findall(r'[+-]\d+', mods):
+            offset += int(amount)
+        return max(0, min(offset, len(self.content)))
+
+    def _index(self, offset):
+        line = self.content.count('\n', 0, offset) + 1
+        column = offset - (self.content.rfind('\n', 0, offset) + 1)
+        return f"{line}.{column}"
+
+
+class FakeText:
+    def __init__(self, content):
+        self._w = ".text"
+        self.tk = FakeTextTk(content)
+
+
+class TextChangeProxyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ide = load_ide()
+
+    def setUp(self):
+        self.text = FakeText("a = 1\nb = '''\nc\n'''\nd = 2")
+        self.proxy = self.ide.TextChangeProxy(self.text)
+        self.changes = []
+        self.line_count = self.text.tk.line_count()
+        self.proxy.listeners.append(self.record)
+
+    def record(self, first, removed, added):
+        self.changes.append((first, removed, added))
+        self.line_count += added - removed
+
+    def send(self, *args):
+        self.text.tk.commands[".text"](*args)
+        self.assertEqual(self.line_count, self.text.tk.line_count())
+
+    def test_backspace_at_column_zero_joins_lines(self):
+        self.send("delete", "3.0-1c")
+        self.assertEqual(self.changes, [(2, 1, 0)])
+
+    def test_delete_at_end_of_line_joins_lines(self):
+        self.send("delete", "1.end")
+        self.assertEqual(self.changes, [(1, 1, 0)])
+
+    def test_single_character_delete_inside_line(self):
+        self.send("delete", "1.2")
+        self.assertEqual(self.changes, [(1, 0, 0)])
+
+    def test_delete_at_end_of_buffer_removes_nothing(self):
+        self.send("delete", "end-1c")
+        self.send("delete", "end")
+        self.assertEqual(self.changes, [(5, 0, 0), (6, 0, 0)])
+
+    def test_range_delete_to_end(self):
+        self.send("delete", "2.0", "end")
+        self.assertEqual(self.changes, [(2, 3, 0)])
+
+    def test_insert_and_replace(self):
+        self.send("insert", "2.0", "x\ny\n")
+        self.send("replace", "1.0", "3.0", "z\n")
+        self.assertEqual(self.changes, [(2, 0, 2), (1, 2, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()